@@ -16,6 +16,7 @@ import os
 import os.path
 import sys
 
+from manic.externals_description import clear_submodule_caches
 from manic.externals_description import create_externals_description
 from manic.externals_description import read_externals_description_file
 from manic.externals_status import check_safe_to_update_repos
@@ -23,9 +24,9 @@ from manic.sourcetree import SourceTree
 from manic.utils import printlog, fatal_error
 from manic.global_constants import VERSION_SEPERATOR, LOG_FILE_NAME
 
-if sys.hexversion < 0x02070000:
+if sys.hexversion < 0x03060000:
     print(70 * '*')
-    print('ERROR: {0} requires python >= 2.7.x. '.format(sys.argv[0]))
+    print('ERROR: {0} requires python >= 3.6.x. '.format(sys.argv[0]))
     print('It appears that you are running python {0}'.format(
         VERSION_SEPERATOR.join(str(x) for x in sys.version_info[0:3])))
     print(70 * '*')
@@ -398,6 +399,9 @@ def main(args):
     if args.optional:
         load_all = True
 
+    # Repositories may have changed since any previous run in this process
+    clear_submodule_caches()
+
     root_dir = os.path.abspath(os.getcwd())
     model_data = read_externals_description_file(root_dir, args.externals)
     ext_description = create_externals_description(
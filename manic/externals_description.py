@@ -17,41 +17,17 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 from __future__ import print_function
 
+import functools
 import logging
 import os
 import os.path
 import re
+import sys
 
-# ConfigParser in python2 was renamed to configparser in python3.
-# In python2, ConfigParser returns byte strings, str, instead of unicode.
-# We need unicode to be compatible with xml and json parser and python3.
-try:
-    # python2
-    from ConfigParser import SafeConfigParser as config_parser
-    from ConfigParser import MissingSectionHeaderError
-    from ConfigParser import NoSectionError, NoOptionError
-
-    USE_PYTHON2 = True
-
-    def config_string_cleaner(text):
-        """convert strings into unicode
-        """
-        return text.decode('utf-8')
-except ImportError:
-    # python3
-    from configparser import ConfigParser as config_parser
-    from configparser import MissingSectionHeaderError
-    from configparser import NoSectionError, NoOptionError
-
-    USE_PYTHON2 = False
-
-    def config_string_cleaner(text):
-        """Python3 already uses unicode strings, so just return the string
-        without modification.
-
-        """
-        return text
+from configparser import MissingSectionHeaderError
+from configparser import NoSectionError, NoOptionError
 
+from .fast_config import FastConfig
 from .utils import printlog, fatal_error, str_to_bool, expand_local_url
 from .utils import execute_subprocess
 from .global_constants import EMPTY_STR, PPRINTER, VERSION_SEPERATOR
@@ -62,20 +38,52 @@ from .global_constants import EMPTY_STR, PPRINTER, VERSION_SEPERATOR
 DESCRIPTION_SECTION = 'externals_description'
 VERSION_ITEM = 'schema_version'
 
+# Parsed description files, keyed by (path, mtime, size) so that a file
+# which is read repeatedly during a run is only parsed once. The cached
+# objects are handed out directly and must not be modified.
+_DESC_CACHE = {}
+
+# Validated submodule descriptions, keyed by (parent repo name, directory),
+# shared by all externals that use from_submodule with the same parent.
+_SUBMOD_DESC_CACHE = {}
+
+_LEADING_WHITESPACE_RE = re.compile(r'^[ \t]+', re.MULTILINE)
+_SEMVER_SPLIT_RE = re.compile(r'[-+]')
+# One line of 'git submodule status' output:
+#   <status char><hash> <path>[ (<describe output>)]
+_SUBMODULE_STATUS_RE = re.compile(
+    r'^([ +\-U])([0-9a-f]+) (.+?)(?: (\(.*\)))?$')
+
+
+def _read_text_file(file_path):
+    """Return the entire contents of a text file, read in a single call.
+    """
+    with open(file_path, 'r', encoding='utf-8') as infile:
+        return infile.read()
+
 
 def read_externals_description_file(root_dir, file_name):
     """Read a file containing an externals description and
     create its internal representation.
 
+    Externals description files are cached, so the returned object may
+    be shared with other callers and must not be modified.
+
     """
     root_dir = os.path.abspath(root_dir)
-    msg = 'In directory : {0}'.format(root_dir)
-    logging.info(msg)
+    logging.info('In directory : %s', root_dir)
     printlog('Processing externals description file : {0} ({1})'.format(file_name,
                                                                         root_dir))
 
     file_path = os.path.join(root_dir, file_name)
-    if not os.path.exists(file_name):
+    if file_name == ExternalsDescription.GIT_SUBMODULES_FILENAME:
+        return _read_gitmodules_file(root_dir, file_name)
+
+    # A single stat both checks that the file exists and provides the
+    # cache key.
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
         if file_name.lower() == "none":
             msg = ('INTERNAL ERROR: Attempt to read externals file '
                    'from {0} when not configured'.format(file_path))
@@ -86,89 +94,72 @@ def read_externals_description_file(root_dir, file_name):
 
         fatal_error(msg)
 
+    cache_key = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+    if cache_key in _DESC_CACHE:
+        return _DESC_CACHE[cache_key]
+
+    text = _read_text_file(file_path)
+
     externals_description = None
-    if file_name == ExternalsDescription.GIT_SUBMODULES_FILENAME:
-        externals_description = _read_gitmodules_file(root_dir, file_name)
-    else:
-        try:
-            config = config_parser()
-            config.read(file_path)
-            externals_description = config
-        except MissingSectionHeaderError:
-            # not a cfg file
-            pass
+    try:
+        config = FastConfig()
+        config.read_string(text, source=file_name)
+        externals_description = config
+    except MissingSectionHeaderError:
+        # not a cfg file
+        pass
 
     if externals_description is None:
         msg = 'Unknown file format!'
         fatal_error(msg)
 
+    _DESC_CACHE[cache_key] = externals_description
     return externals_description
 
-class LstripReader(object):
-    "LstripReader formats .gitmodules files to be acceptable for configparser"
-    def __init__(self, filename):
-        with open(filename, 'r') as infile:
-            lines = infile.readlines()
-        self._lines = list()
-        self._num_lines = len(lines)
-        self._index = 0
-        for line in lines:
-            self._lines.append(line.lstrip())
-
-    def readlines(self):
-        """Return all the lines from this object's file"""
-        return self._lines
-
-    def readline(self, size=-1):
-        """Format and return the next line or raise StopIteration"""
-        try:
-            line = self.next()
-        except StopIteration:
-            line = ''
-
-        if (size > 0) and (len(line) < size):
-            return line[0:size]
-
-        return line
-
-    def __iter__(self):
-        """Begin an iteration"""
-        self._index = 0
-        return self
-
-    def next(self):
-        """Return the next line or raise StopIteration"""
-        if self._index >= self._num_lines:
-            raise StopIteration
-
-        self._index = self._index + 1
-        return self._lines[self._index - 1]
-
-    def __next__(self):
-        return self.next()
-
 def git_submodule_status(repo_dir):
     """Run the git submodule status command to obtain submodule hashes.
-        """
+
+    The result is cached per repository directory, each caller gets its
+    own copy. Call clear_submodule_caches after changing what is checked
+    out in a repository.
+    """
+    submodules = _git_submodule_status_cached(os.path.abspath(repo_dir))
+    return {path: dict(submod) for path, submod in submodules.items()}
+
+
+def clear_submodule_caches():
+    """Forget all cached submodule information.
+    """
+    _git_submodule_status_cached.cache_clear()
+    _SUBMOD_DESC_CACHE.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _git_submodule_status_cached(repo_dir):
+    """Memoized body of git_submodule_status. repo_dir must be an
+    absolute path so that equivalent paths share a cache entry.
+    """
     # This function is here instead of GitRepository to avoid a dependency loop
-    cmd = 'git -C {repo_dir} submodule status'.format(
-        repo_dir=repo_dir).split()
-    git_output = execute_subprocess(cmd, output_to_caller=True)
-    submodules = {}
-    submods = git_output.split('\n')
-    for submod in submods:
-        if submod:
-            status = submod[0]
-            items = submod[1:].split(' ')
-            if len(items) > 2:
-                tag = items[2]
-            else:
-                tag = None
+    cmd = ['git', 'submodule', 'status']
+    git_output = execute_subprocess(cmd, output_to_caller=True, cwd=repo_dir)
+    return _parse_submodule_status(git_output)
 
-            submodules[items[1]] = {'hash':items[0], 'status':status, 'tag':tag}
+
+def _parse_submodule_status(git_output):
+    """Convert the output of git submodule status into a dictionary of
+    {path: {'hash', 'status', 'tag'}}. The tag is None when git could
+    not describe the commit.
+    """
+    submodules = {}
+    for line in git_output.splitlines():
+        match = _SUBMODULE_STATUS_RE.match(line)
+        if match:
+            status, git_hash, path, tag = match.groups()
+            submodules[path] = {'hash':git_hash, 'status':status, 'tag':tag}
 
     return submodules
 
+
 def parse_submodules_desc_section(section_items, file_path):
     """Find the path and url for this submodule description"""
     path = None
@@ -190,8 +181,6 @@ def parse_submodules_desc_section(section_items, file_path):
     return path, url
 
 def _read_gitmodules_file(root_dir, file_name):
-    # pylint: disable=deprecated-method
-    # Disabling this check because the method is only used for python2
     # pylint: disable=too-many-locals
     # pylint: disable=too-many-branches
     # pylint: disable=too-many-statements
@@ -199,40 +188,30 @@ def _read_gitmodules_file(root_dir, file_name):
     externals description.
     """
     root_dir = os.path.abspath(root_dir)
-    msg = 'In directory : {0}'.format(root_dir)
-    logging.info(msg)
+    logging.info('In directory : %s', root_dir)
 
     file_path = os.path.join(root_dir, file_name)
-    if not os.path.exists(file_name):
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
         msg = ('ERROR: submodules description file, "{0}", does not '
                'exist in dir:\n    {1}'.format(file_name, root_dir))
         fatal_error(msg)
 
-    submodules_description = None
-    externals_description = None
-    try:
-        config = config_parser()
-        if USE_PYTHON2:
-            config.readfp(LstripReader(file_path), filename=file_name)
-        else:
-            config.read_file(LstripReader(file_path), source=file_name)
-
-        submodules_description = config
-    except MissingSectionHeaderError:
-        # not a cfg file
-        pass
+    submodules_description = _parse_gitmodules_file(file_path, file_name,
+                                                    file_stat)
 
+    externals_description = None
     if submodules_description is None:
         msg = 'Unknown file format!'
         fatal_error(msg)
     else:
         # Convert the submodules description to an externals description
-        externals_description = config_parser()
-        # We need to grab all the commit hashes for this repo
+        externals_description = FastConfig()
         submods = git_submodule_status(root_dir)
         for section in submodules_description.sections():
             if section[0:9] == 'submodule':
-                sec_name = section[9:].strip(' "')
+                sec_name = sys.intern(section[9:].strip(' "'))
                 externals_description.add_section(sec_name)
                 section_items = submodules_description.items(section)
                 path, url = parse_submodules_desc_section(section_items,
@@ -276,6 +255,34 @@ def _read_gitmodules_file(root_dir, file_name):
 
     return externals_description
 
+
+def _parse_gitmodules_file(file_path, file_name, file_stat):
+    """Parse a .gitmodules file, returning None if it is not in config
+    file format. The result is cached and must not be modified.
+
+    """
+    cache_key = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+    if cache_key in _DESC_CACHE:
+        return _DESC_CACHE[cache_key]
+
+    text = _read_text_file(file_path)
+    # .gitmodules files are usually indented, strip that so the
+    # contents are acceptable to the config parser
+    text = _LEADING_WHITESPACE_RE.sub('', text)
+
+    submodules_description = None
+    try:
+        config = FastConfig()
+        config.read_string(text, source=file_name)
+
+        submodules_description = config
+    except MissingSectionHeaderError:
+        # not a cfg file
+        pass
+
+    _DESC_CACHE[cache_key] = submodules_description
+    return submodules_description
+
 def create_externals_description(
         model_data, model_format='cfg', components=None, exclude=None, parent_repo=None):
     """Create the a externals description object from the provided data
@@ -325,7 +332,7 @@ def get_cfg_schema_version(model_cfg):
 
     # NOTE(bja, 2017-11) Assume we don't care about the
     # build/pre-release metadata for now!
-    version_list = re.split(r'[-+]', semver_str)
+    version_list = _SEMVER_SPLIT_RE.split(semver_str)
     version_str = version_list[0]
     version = version_str.split(VERSION_SEPERATOR)
     try:
@@ -340,6 +347,38 @@ def get_cfg_schema_version(model_cfg):
     return major, minor, patch
 
 
+def _compile_schema(schema, prefix=()):
+    """Flatten a nested schema into a list of (key_path, type) pairs,
+    where key_path is the tuple of keys leading to an item and type is
+    the type the item must have. Each dictionary is listed before its
+    contents, so the paths can be checked in order.
+
+    """
+    flat_schema = []
+    for key, value in schema.items():
+        path = prefix + (key,)
+        flat_schema.append((path, type(value)))
+        if isinstance(value, dict):
+            flat_schema.extend(_compile_schema(value, path))
+    return flat_schema
+
+
+def _matches_flat_schema(flat_schema, data):
+    """Return True if data has every item in the flattened schema, with
+    the required type.
+
+    """
+    for path, item_type in flat_schema:
+        item = data
+        for key in path:
+            if key not in item:
+                return False
+            item = item[key]
+        if not isinstance(item, item_type):
+            return False
+    return True
+
+
 class ExternalsDescription(dict):
     """Base externals description class that is independent of the user input
     format. Different input formats can all be converted to this
@@ -378,7 +417,8 @@ class ExternalsDescription(dict):
     PROTOCOL_GIT = 'git'
     PROTOCOL_SVN = 'svn'
     GIT_SUBMODULES_FILENAME = '.gitmodules'
-    KNOWN_PRROTOCOLS = [PROTOCOL_GIT, PROTOCOL_SVN, PROTOCOL_EXTERNALS_ONLY]
+    KNOWN_PRROTOCOLS = frozenset((PROTOCOL_GIT, PROTOCOL_SVN,
+                                  PROTOCOL_EXTERNALS_ONLY))
 
     # v1 xml keywords
     _V1_TREE_PATH = 'TREE_PATH'
@@ -401,6 +441,8 @@ class ExternalsDescription(dict):
                              SPARSE: 'string',
                             }
                      }
+    # The schema flattened once, shared by all instances, used by _validate
+    _FLAT_SOURCE_SCHEMA = _compile_schema(_source_schema)
 
     def __init__(self, parent_repo=None):
         """Convert the xml into a standardized dict that can be used to
@@ -421,20 +463,15 @@ class ExternalsDescription(dict):
         """Use semantic versioning rules to verify we can process this schema.
 
         """
-        known = '{0}.{1}.{2}'.format(self._schema_major,
-                                     self._schema_minor,
-                                     self._schema_patch)
-        received = '{0}.{1}.{2}'.format(self._input_major,
-                                        self._input_minor,
-                                        self._input_patch)
-
         if self._input_major != self._schema_major:
             # should never get here, the factory should handle this correctly!
+            known, received = self._schema_version_strings()
             msg = ('DEV_ERROR: version "{0}" parser received '
                    'version "{1}" input.'.format(known, received))
             fatal_error(msg)
 
         if self._input_minor > self._schema_minor:
+            known, received = self._schema_version_strings()
             msg = ('Incompatible schema version:\n'
                    '  User supplied schema version "{0}" is too new."\n'
                    '  Can only process version "{1}" files and '
@@ -446,6 +483,19 @@ class ExternalsDescription(dict):
             # conditions the test is needed.
             pass
 
+    def _schema_version_strings(self):
+        """Return the supported and the user supplied schema versions as
+        strings, for error messages.
+
+        """
+        known = '{0}.{1}.{2}'.format(self._schema_major,
+                                     self._schema_minor,
+                                     self._schema_patch)
+        received = '{0}.{1}.{2}'.format(self._input_major,
+                                        self._input_minor,
+                                        self._input_patch)
+        return known, received
+
     def _check_user_input(self):
         """Run a series of checks to attempt to validate the user input and
         detect errors as soon as possible.
@@ -464,59 +514,47 @@ class ExternalsDescription(dict):
 
     def _check_data(self):
         # pylint: disable=too-many-branches,too-many-statements
+        # pylint: disable=too-many-locals
         """Check user supplied data is valid where possible.
         """
-        for ext_name in self.keys():
-            if (self[ext_name][self.REPO][self.PROTOCOL]
-                    not in self.KNOWN_PRROTOCOLS):
+        tag_key = self.TAG
+        branch_key = self.BRANCH
+        hash_key = self.HASH
+        submodule_key = self.SUBMODULE
+        repo_url_key = self.REPO_URL
+        known_protocols = self.KNOWN_PRROTOCOLS
+        for ext_name in self:
+            ext = self[ext_name]
+            repo = ext[self.REPO]
+            protocol = repo[self.PROTOCOL]
+            if protocol not in known_protocols:
                 msg = 'Unknown repository protocol "{0}" in "{1}".'.format(
-                    self[ext_name][self.REPO][self.PROTOCOL], ext_name)
+                    protocol, ext_name)
                 fatal_error(msg)
 
-            if (self[ext_name][self.REPO][self.PROTOCOL] ==
-                    self.PROTOCOL_SVN):
-                if self.HASH in self[ext_name][self.REPO]:
+            if protocol == self.PROTOCOL_SVN:
+                if hash_key in repo:
                     msg = ('In repo description for "{0}". svn repositories '
                            'may not include the "hash" keyword.'.format(
                                ext_name))
                     fatal_error(msg)
 
-            if ((self[ext_name][self.REPO][self.PROTOCOL] != self.PROTOCOL_GIT)
-                    and (self.SUBMODULE in self[ext_name])):
+            if protocol != self.PROTOCOL_GIT and submodule_key in ext:
                 msg = ('self.SUBMODULE is only supported with {0} protocol, '
                        '"{1}" is defined as an {2} repository')
-                fatal_error(msg.format(self.PROTOCOL_GIT, ext_name,
-                                       self[ext_name][self.REPO][self.PROTOCOL]))
-
-            if (self[ext_name][self.REPO][self.PROTOCOL] !=
-                    self.PROTOCOL_EXTERNALS_ONLY):
-                ref_count = 0
-                found_refs = ''
-                if self.TAG in self[ext_name][self.REPO]:
-                    ref_count += 1
-                    found_refs = '"{0} = {1}", {2}'.format(
-                        self.TAG, self[ext_name][self.REPO][self.TAG],
-                        found_refs)
-                if self.BRANCH in self[ext_name][self.REPO]:
-                    ref_count += 1
-                    found_refs = '"{0} = {1}", {2}'.format(
-                        self.BRANCH, self[ext_name][self.REPO][self.BRANCH],
-                        found_refs)
-                if self.HASH in self[ext_name][self.REPO]:
-                    ref_count += 1
-                    found_refs = '"{0} = {1}", {2}'.format(
-                        self.HASH, self[ext_name][self.REPO][self.HASH],
-                        found_refs)
-                if (self.SUBMODULE in self[ext_name] and
-                        self[ext_name][self.SUBMODULE]):
-                    ref_count += 1
-                    found_refs = '"{0} = {1}", {2}'.format(
-                        self.SUBMODULE,
-                        self[ext_name][self.SUBMODULE], found_refs)
+                fatal_error(msg.format(self.PROTOCOL_GIT, ext_name, protocol))
+
+            if protocol != self.PROTOCOL_EXTERNALS_ONLY:
+                from_submodule = submodule_key in ext and ext[submodule_key]
+                present = [key for key in (tag_key, branch_key, hash_key)
+                           if key in repo]
+                if from_submodule:
+                    present.append(submodule_key)
+                ref_count = len(present)
 
                 if ref_count > 1:
                     msg = 'Model description is over specified! '
-                    if self.SUBMODULE in self[ext_name]:
+                    if submodule_key in ext:
                         msg += ('from_submodule is not compatible with '
                                 '"tag", "branch", or "hash" ')
                     else:
@@ -524,7 +562,8 @@ class ExternalsDescription(dict):
                                 'may be specified ')
 
                     msg += 'for repo description of "{0}".'.format(ext_name)
-                    msg = '{0}\nFound: {1}'.format(msg, found_refs)
+                    msg = '{0}\nFound: {1}'.format(
+                        msg, self._format_found_refs(ext, repo, present))
                     fatal_error(msg)
                 elif ref_count < 1:
                     msg = ('Model description is under specified! One of '
@@ -532,25 +571,22 @@ class ExternalsDescription(dict):
                            'repo description of "{0}"'.format(ext_name))
                     fatal_error(msg)
 
-                if (self.REPO_URL not in self[ext_name][self.REPO] and
-                        (self.SUBMODULE not in self[ext_name] or
-                         not self[ext_name][self.SUBMODULE])):
+                if repo_url_key not in repo and not from_submodule:
                     msg = ('Model description is under specified! Must have '
                            '"repo_url" in repo '
                            'description for "{0}"'.format(ext_name))
                     fatal_error(msg)
 
-                if (self.SUBMODULE in self[ext_name] and
-                        self[ext_name][self.SUBMODULE]):
-                    if self.REPO_URL in self[ext_name][self.REPO]:
+                if from_submodule:
+                    if repo_url_key in repo:
                         msg = ('Model description is over specified! '
                                'from_submodule keyword is not compatible '
-                               'with {0} keyword for'.format(self.REPO_URL))
+                               'with {0} keyword for'.format(repo_url_key))
                         msg = '{0} repo description of "{1}"'.format(msg,
                                                                      ext_name)
                         fatal_error(msg)
 
-                    if self.PATH in self[ext_name]:
+                    if self.PATH in ext:
                         msg = ('Model description is over specified! '
                                'from_submodule keyword is not compatible with '
                                '{0} keyword for'.format(self.PATH))
@@ -558,10 +594,23 @@ class ExternalsDescription(dict):
                                                                      ext_name)
                         fatal_error(msg)
 
-                if self.REPO_URL in self[ext_name][self.REPO]:
-                    url = expand_local_url(
-                        self[ext_name][self.REPO][self.REPO_URL], ext_name)
-                    self[ext_name][self.REPO][self.REPO_URL] = url
+                if repo_url_key in repo:
+                    repo[repo_url_key] = expand_local_url(repo[repo_url_key],
+                                                          ext_name)
+
+    def _format_found_refs(self, ext, repo, present):
+        """Format the references specified for an external, for use in
+        the over specified error message.
+
+        """
+        found_refs = ''
+        for key in present:
+            if key == self.SUBMODULE:
+                value = ext[key]
+            else:
+                value = repo[key]
+            found_refs = '"{0} = {1}", {2}'.format(key, value, found_refs)
+        return found_refs
 
     def _check_optional(self):
         # pylint: disable=too-many-branches
@@ -631,29 +680,34 @@ class ExternalsDescription(dict):
         """
         if submod_desc is None:
             repo_path = os.getcwd() # Is this always correct?
-            submod_file = self._parent_repo.submodules_file(repo_path=repo_path)
-            if submod_file is None:
-                msg = ('Cannot checkout "{0}" from submodule information\n'
-                       '       Parent repo, "{1}" does not have submodules')
-                fatal_error(msg.format(field, self._parent_repo.name()))
-
-            printlog(
-                'Processing submodules description file : {0} ({1})'.format(
-                    submod_file, repo_path))
-            submod_model_data= _read_gitmodules_file(repo_path, submod_file)
-            submod_desc = create_externals_description(submod_model_data)
+            cache_key = (self._parent_repo.name(), os.path.abspath(repo_path))
+            submod_desc = _SUBMOD_DESC_CACHE.get(cache_key)
+            if submod_desc is None:
+                submod_file = self._parent_repo.submodules_file(
+                    repo_path=repo_path)
+                if submod_file is None:
+                    msg = ('Cannot checkout "{0}" from submodule '
+                           'information\n'
+                           '       Parent repo, "{1}" does not have '
+                           'submodules')
+                    fatal_error(msg.format(field, self._parent_repo.name()))
+
+                msg = 'Processing submodules description file : {0} ({1})'
+                printlog(msg.format(submod_file, repo_path))
+                submod_model_data = _read_gitmodules_file(repo_path,
+                                                          submod_file)
+                submod_desc = create_externals_description(submod_model_data)
+                _SUBMOD_DESC_CACHE[cache_key] = submod_desc
 
         # Can we find our external?
         repo_url = None
         repo_path = None
         ref_hash = None
-        for ext_field in submod_desc:
-            if field == ext_field:
-                ext = submod_desc[ext_field]
-                repo_url = ext[self.REPO][self.REPO_URL]
-                repo_path = ext[self.PATH]
-                ref_hash = ext[self.REPO][self.HASH]
-                break
+        ext = submod_desc.get(field)
+        if ext is not None:
+            repo_url = ext[self.REPO][self.REPO_URL]
+            repo_path = ext[self.PATH]
+            ref_hash = ext[self.REPO][self.HASH]
 
         return repo_url, repo_path, ref_hash, submod_desc
 
@@ -718,8 +772,9 @@ class ExternalsDescription(dict):
             return is_valid
 
         for field in self:
-            valid = validate_data_struct(self._source_schema, self[field])
-            if not valid:
+            if not _matches_flat_schema(self._FLAT_SOURCE_SCHEMA, self[field]):
+                # Walk the nested schema again to report the differences
+                validate_data_struct(self._source_schema, self[field])
                 PPRINTER.pprint(self._source_schema)
                 PPRINTER.pprint(self[field])
                 msg = 'ERROR: source for "{0}" did not validate'.format(field)
@@ -744,15 +799,12 @@ class ExternalsDescriptionDict(ExternalsDescription):
         self._input_minor = 0
         self._input_patch = 0
         self._verify_schema_version()
-        if components:
-            for key in list(model_data.keys()):
-                if key not in components:
-                    del model_data[key]
-
-        if exclude:
-            for key in list(model_data.keys()):
-                if key in exclude:
-                    del model_data[key]
+        if components or exclude:
+            components = frozenset(components) if components else None
+            exclude = frozenset(exclude) if exclude else frozenset()
+            model_data = {key: value for key, value in model_data.items()
+                          if (components is None or key in components) and
+                          key not in exclude}
 
         self.update(model_data)
         self._check_user_input()
@@ -778,21 +830,13 @@ class ExternalsDescriptionConfigV1(ExternalsDescription):
         self._input_major, self._input_minor, self._input_patch = \
             get_cfg_schema_version(model_data)
         self._verify_schema_version()
-        self._remove_metadata(model_data)
         self._parse_cfg(model_data, components=components, exclude=exclude)
         self._check_user_input()
 
-    @staticmethod
-    def _remove_metadata(model_data):
-        """Remove the metadata section from the model configuration file so
-        that it is simpler to look through the file and construct the
-        externals description.
-
-        """
-        model_data.remove_section(DESCRIPTION_SECTION)
-
     def _parse_cfg(self, cfg_data, components=None, exclude=None):
         """Parse a config_parser object into a externals description.
+        The metadata section is skipped. cfg_data may be shared with
+        other readers, so it is not modified.
 
         components: list of component names to include, None to include all.
         exclude: list of component names to skip.
@@ -802,15 +846,19 @@ class ExternalsDescriptionConfigV1(ExternalsDescription):
             """
             output_dict = {}
             for item in input_list:
-                key = config_string_cleaner(item[0].strip())
-                value = config_string_cleaner(item[1].strip())
+                key = item[0].strip()
+                value = item[1].strip()
                 if convert_to_lower_case:
                     key = key.lower()
-                output_dict[key] = value
+                # Keys are compared against the schema constants many
+                # times, interning makes those lookups cheaper
+                output_dict[sys.intern(key)] = value
             return output_dict
 
         for section in cfg_data.sections():
-            name = config_string_cleaner(section.lower().strip())
+            if section == DESCRIPTION_SECTION:
+                continue
+            name = sys.intern(section.lower().strip())
             if (components and name not in components) or (exclude and name in exclude):
                 continue
             self[name] = {}
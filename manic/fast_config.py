@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Minimal parser for externals description and .gitmodules files
+
+Externals description files and .gitmodules files only use [section]
+headers and simple 'key = value' items, so the general purpose
+configparser machinery (interpolation, converters, configurable
+syntax) is not needed. FastConfig parses these files with a few
+precompiled regular expressions, following the ConfigParser rules for
+the default syntax, and supports the subset of the ConfigParser API
+used by manic. Errors are reported with the configparser exception types so
+callers can handle both objects the same way.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import re
+from collections import OrderedDict
+
+from configparser import DEFAULTSECT
+from configparser import MissingSectionHeaderError, ParsingError
+from configparser import NoSectionError, NoOptionError
+from configparser import DuplicateSectionError, DuplicateOptionError
+
+_SECTION_RE = re.compile(r'\[(?P<header>.+)\]')
+_OPTION_RE = re.compile(r'(?P<option>.*?)\s*[=:]\s*(?P<value>.*)$')
+_NONSPACE_RE = re.compile(r'\S')
+_COMMENT_PREFIXES = ('#', ';')
+
+
+class FastConfig(object):
+    """Dictionary of dictionaries holding the contents of a config file,
+    with a ConfigParser compatible interface.
+
+    Parsing follows ConfigParser with its default settings and no
+    interpolation: option names are converted to lower case, section
+    names are case sensitive, lines indented deeper than their option
+    continue its value (including blank lines), the [DEFAULT] section
+    provides fallback values for every other section, and repeated
+    sections or options within a source raise an error.
+
+    """
+
+    def __init__(self):
+        self._defaults = OrderedDict()
+        self._sections = OrderedDict()
+
+    @staticmethod
+    def optionxform(optionstr):
+        """Convert an option name to its internal form."""
+        return optionstr.lower()
+
+    # ----------------------------------------------------------------
+    #
+    # reading
+    #
+    # ----------------------------------------------------------------
+    def read_string(self, string, source='<string>'):
+        """Read configuration from a string."""
+        self.read_file(string.splitlines(), source=source)
+
+    def read_file(self, lines, source='<???>'):
+        """Read configuration from an iterable of lines, e.g. an open file.
+
+        Values are collected as lists of lines while reading and joined
+        once the whole source has been parsed.
+        """
+        # pylint: disable=too-many-branches
+        elements_added = set()
+        cursect = None
+        sectname = None
+        optname = None
+        indent_level = 0
+        for lineno, line in enumerate(lines, start=1):
+            value = line.strip()
+            if not value:
+                # Blank lines are kept as part of a multiline value
+                if cursect is not None and optname:
+                    cursect[optname].append('')
+                continue
+            if value.startswith(_COMMENT_PREFIXES):
+                continue
+
+            cur_indent_level = _NONSPACE_RE.search(line).start()
+            if (cursect is not None and optname and
+                    cur_indent_level > indent_level):
+                # Continuation of a multiline value
+                cursect[optname].append(value)
+                continue
+            indent_level = cur_indent_level
+
+            match = _SECTION_RE.match(value)
+            if match:
+                sectname = match.group('header')
+                if sectname in self._sections:
+                    if sectname in elements_added:
+                        raise DuplicateSectionError(sectname, source, lineno)
+                    cursect = self._sections[sectname]
+                elif sectname == DEFAULTSECT:
+                    cursect = self._defaults
+                else:
+                    cursect = OrderedDict()
+                    self._sections[sectname] = cursect
+                elements_added.add(sectname)
+                optname = None
+                continue
+
+            if cursect is None:
+                raise MissingSectionHeaderError(source, lineno, line)
+
+            match = _OPTION_RE.match(value)
+            if not match or not match.group('option'):
+                error = ParsingError(source)
+                error.append(lineno, repr(line))
+                raise error
+            optname = self.optionxform(match.group('option').rstrip())
+            if (sectname, optname) in elements_added:
+                raise DuplicateOptionError(sectname, optname, source, lineno)
+            elements_added.add((sectname, optname))
+            cursect[optname] = [match.group('value').strip()]
+
+        for options in [self._defaults] + list(self._sections.values()):
+            for name, val in options.items():
+                if isinstance(val, list):
+                    options[name] = '\n'.join(val).rstrip()
+
+    # ----------------------------------------------------------------
+    #
+    # ConfigParser interface
+    #
+    # ----------------------------------------------------------------
+    def sections(self):
+        """Return a list of section names, excluding [DEFAULT]."""
+        return list(self._sections)
+
+    def has_section(self, section):
+        """Indicate whether the named section is present. The default
+        section is not acknowledged.
+        """
+        return section in self._sections
+
+    def add_section(self, section):
+        """Create a new, empty section."""
+        if section == DEFAULTSECT:
+            raise ValueError('Invalid section name: {0!r}'.format(section))
+        if section in self._sections:
+            raise DuplicateSectionError(section)
+        self._sections[section] = OrderedDict()
+
+    def remove_section(self, section):
+        """Remove a section. Returns True if the section existed."""
+        existed = section in self._sections
+        if existed:
+            del self._sections[section]
+        return existed
+
+    def _options(self, section):
+        """Return the option dictionary for the named section."""
+        if section == DEFAULTSECT:
+            return self._defaults
+        try:
+            return self._sections[section]
+        except KeyError:
+            raise NoSectionError(section)
+
+    def items(self, section):
+        """Return a list of (name, value) pairs for the section, including
+        the values inherited from [DEFAULT]."""
+        options = self._options(section)
+        merged = OrderedDict(self._defaults)
+        merged.update(options)
+        return list(merged.items())
+
+    def get(self, section, option):
+        """Get an option value for the named section, falling back to
+        [DEFAULT]."""
+        options = self._options(section)
+        option = self.optionxform(option)
+        try:
+            return options[option]
+        except KeyError:
+            pass
+        try:
+            return self._defaults[option]
+        except KeyError:
+            raise NoOptionError(option, section)
+
+    def set(self, section, option, value):
+        """Set an option in the named section."""
+        self._options(section)[self.optionxform(option)] = value
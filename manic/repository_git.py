@@ -14,6 +14,7 @@ from .global_constants import VERBOSITY_VERBOSE
 from .repository import Repository
 from .externals_status import ExternalStatus
 from .externals_description import ExternalsDescription, git_submodule_status
+from .externals_description import clear_submodule_caches
 from .utils import expand_local_url, split_remote_url, is_remote_url
 from .utils import fatal_error, printlog
 from .utils import execute_subprocess
@@ -64,6 +65,9 @@ class GitRepository(Repository):
                 repo_dir_path)) or not repo_dir_exists:
             self._clone_repo(base_dir_path, repo_dir_name, verbosity)
         self._checkout_ref(repo_dir_path, verbosity, recursive)
+        # The checkout changes the submodule status of this repository
+        # and of any repository containing it.
+        clear_submodule_caches()
         gmpath = os.path.join(repo_dir_path,
                               ExternalsDescription.GIT_SUBMODULES_FILENAME)
         if os.path.exists(gmpath):
@@ -228,7 +228,7 @@ all repositories without entering your authentication information.
 
 
 def execute_subprocess(commands, status_to_caller=False,
-                       output_to_caller=False):
+                       output_to_caller=False, cwd=None):
     """Wrapper around subprocess.check_output to handle common
     exceptions.
 
@@ -240,8 +240,13 @@ def execute_subprocess(commands, status_to_caller=False,
     return code, otherwise execute_subprocess treats non-zero return
     status as an error and raises an exception.
 
+    If cwd is given, the command runs in that directory instead of the
+    current working directory. Unlike os.chdir, this does not change
+    the state of the calling process, so it is safe to use from threads.
+
     """
-    cwd = os.getcwd()
+    if cwd is None:
+        cwd = os.getcwd()
     msg = 'In directory: {0}\nexecute_subprocess running command:'.format(cwd)
     logging.info(msg)
     commands_str = ' '.join(commands)
@@ -255,19 +260,19 @@ def execute_subprocess(commands, status_to_caller=False,
     hanging_timer.start()
     try:
         output = subprocess.check_output(commands, stderr=subprocess.STDOUT,
-                                         universal_newlines=True)
+                                         universal_newlines=True, cwd=cwd)
         log_process_output(output)
         status = 0
     except OSError as error:
         msg = failed_command_msg(
             'Command execution failed. Does the executable exist?',
-            commands)
+            commands, cwd=cwd)
         logging.error(error)
         fatal_error(msg)
     except ValueError as error:
         msg = failed_command_msg(
             'DEV_ERROR: Invalid arguments trying to run subprocess',
-            commands)
+            commands, cwd=cwd)
         logging.error(error)
         fatal_error(msg)
     except subprocess.CalledProcessError as error:
@@ -280,7 +285,7 @@ def execute_subprocess(commands, status_to_caller=False,
             msg_context = ('Process did not run successfully; '
                            'returned status {0}'.format(error.returncode))
             msg = failed_command_msg(msg_context, commands,
-                                     output=error.output)
+                                     output=error.output, cwd=cwd)
             logging.error(error)
             logging.error(msg)
             log_process_output(error.output)
@@ -301,11 +306,14 @@ def execute_subprocess(commands, status_to_caller=False,
     return ret_value
 
 
-def failed_command_msg(msg_context, command, output=None):
+def failed_command_msg(msg_context, command, output=None, cwd=None):
     """Template for consistent error messages from subprocess calls.
 
     If 'output' is given, it should provide the output from the failed
     command
+
+    If 'cwd' is given, it is the directory the command ran in, otherwise
+    the current working directory is reported
     """
 
     if output:
@@ -322,7 +330,7 @@ def failed_command_msg(msg_context, command, output=None):
     {cwd}
 {context}:
     {command}
-""".format(cwd=os.getcwd(), context=msg_context, command=command_str)
+""".format(cwd=cwd or os.getcwd(), context=msg_context, command=command_str)
 
     if output:
         errmsg += 'See above for output from failed command.\n'
@@ -57,15 +57,7 @@ from manic.global_constants import LOCAL_PATH_INDICATOR, VERBOSITY_DEFAULT
 from manic.global_constants import LOG_FILE_NAME
 from manic import checkout
 
-# ConfigParser was renamed in python2 to configparser. In python2,
-# ConfigParser returns byte strings, str, instead of unicode. We need
-# unicode to be compatible with xml and json parser and python3.
-try:
-    # python2
-    from ConfigParser import SafeConfigParser as config_parser
-except ImportError:
-    # python3
-    from configparser import ConfigParser as config_parser
+from configparser import ConfigParser as config_parser
 
 # ---------------------------------------------------------------------
 #
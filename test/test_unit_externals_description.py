@@ -14,26 +14,10 @@ from __future__ import print_function
 import os
 import os.path
 import shutil
+import tempfile
 import unittest
 
-try:
-    # python2
-    from ConfigParser import SafeConfigParser as config_parser
-
-    def config_string_cleaner(text):
-        """convert strings into unicode
-        """
-        return text.decode('utf-8')
-except ImportError:
-    # python3
-    from configparser import ConfigParser as config_parser
-
-    def config_string_cleaner(text):
-        """Python3 already uses unicode strings, so just return the string
-        without modification.
-
-        """
-        return text
+from configparser import ConfigParser as config_parser
 
 from manic.externals_description import DESCRIPTION_SECTION, VERSION_ITEM
 from manic.externals_description import ExternalsDescription
@@ -42,9 +26,19 @@ from manic.externals_description import ExternalsDescriptionConfigV1
 from manic.externals_description import get_cfg_schema_version
 from manic.externals_description import read_externals_description_file
 from manic.externals_description import create_externals_description
+from manic.externals_description import git_submodule_status
+from manic.externals_description import clear_submodule_caches
+from manic.externals_description import _parse_submodule_status
+import manic.externals_description
 
 from manic.global_constants import EMPTY_STR
 
+# Commit hashes used in fake 'git submodule status' output
+SUBMOD_HASH1 = '5a1f30e6b9f3c2a8d4e7b0c1f2a3b4c5d6e7f809'
+SUBMOD_HASH2 = '0b2c4d6e8f0a1b2c3d4e5f60718293a4b5c6d7e8'
+SUBMOD_HASH3 = 'c3d4e5f60718293a4b5c6d7e8f90a1b2c3d4e5f6'
+SUBMOD_HASH4 = '0000000000000000000000000000000000000000'
+
 
 class TestCfgSchemaVersion(unittest.TestCase):
     """Test that schema identification for the externals description
@@ -307,6 +301,50 @@ invalid file format
             read_externals_description_file(root_dir, filename)
         os.remove(file_path)
 
+    def test_file_relative_to_root_dir(self):
+        """Test that the file is found relative to root_dir, not the
+        current working directory.
+
+        """
+        root_dir = os.path.abspath(self.TMP_FAKE_DIR)
+        filename = 'externals.cfg'
+        contents = """
+[{0}]
+{1} = 1.0.0
+""".format(DESCRIPTION_SECTION, VERSION_ITEM)
+        with open(os.path.join(root_dir, filename), 'w') as fhandle:
+            fhandle.write(contents)
+        config = read_externals_description_file(root_dir, filename)
+        self.assertEqual(config.get(DESCRIPTION_SECTION, VERSION_ITEM),
+                         '1.0.0')
+
+    def test_reread_uses_cache(self):
+        """Test that reading the same file twice returns the cached object,
+        and that creating a description from it leaves it unchanged.
+
+        """
+        root_dir = os.path.abspath(self.TMP_FAKE_DIR)
+        filename = 'externals.cfg'
+        contents = """
+[comp1]
+local_path = path/to/comp1
+protocol = git
+repo_url = /path/to/comp1
+tag = v1
+required = True
+
+[{0}]
+{1} = 1.0.0
+""".format(DESCRIPTION_SECTION, VERSION_ITEM)
+        with open(os.path.join(root_dir, filename), 'w') as fhandle:
+            fhandle.write(contents)
+        first = read_externals_description_file(root_dir, filename)
+        create_externals_description(first)
+        second = read_externals_description_file(root_dir, filename)
+        self.assertIs(first, second)
+        self.assertEqual(second.sections(), ['comp1', DESCRIPTION_SECTION])
+        self.assertEqual(second.get('comp1', 'tag'), 'v1')
+
 
 class TestCreateExternalsDescription(unittest.TestCase):
     """Test the application logic of creat_externals_description
@@ -413,6 +451,27 @@ class TestCreateExternalsDescription(unittest.TestCase):
         ext = create_externals_description(desc, model_format='dict')
         self.assertIsInstance(ext, ExternalsDescriptionDict)
 
+    def test_dict_invalid_type(self):
+        """Test that a dictionary with an item of the wrong type does not
+        validate.
+
+        """
+        rdata = {ExternalsDescription.PROTOCOL: 'git',
+                 ExternalsDescription.REPO_URL: '/path/to/repo',
+                 ExternalsDescription.TAG: 'tagv1',
+                }
+
+        desc = {
+            'test': {
+                ExternalsDescription.REQUIRED: 'False',
+                ExternalsDescription.PATH: '../fake',
+                ExternalsDescription.EXTERNALS: EMPTY_STR,
+                ExternalsDescription.REPO: rdata, },
+        }
+
+        with self.assertRaises(RuntimeError):
+            create_externals_description(desc, model_format='dict')
+
     def test_cfg_component_dict(self):
         """Verify that create_externals_description works with a dictionary
         """
@@ -474,5 +533,253 @@ class TestCreateExternalsDescription(unittest.TestCase):
             create_externals_description(self._config, model_format='unknown')
 
 
+class TestParseSubmoduleStatus(unittest.TestCase):
+    """Test parsing the output of git submodule status
+    """
+
+    def test_status_prefixes(self):
+        """Test that every status prefix is parsed, with and without
+        describe output.
+
+        """
+        git_output = (' {0} components/comp1 (v1.2.0)\n'
+                      '-{1} components/comp2\n'
+                      '+{2} components/comp3 (heads/main-3-gc3d4e5f)\n'
+                      'U{3} components/comp4\n').format(
+                          SUBMOD_HASH1, SUBMOD_HASH2, SUBMOD_HASH3,
+                          SUBMOD_HASH4)
+        expected = {
+            'components/comp1': {'hash': SUBMOD_HASH1, 'status': ' ',
+                                 'tag': '(v1.2.0)'},
+            'components/comp2': {'hash': SUBMOD_HASH2, 'status': '-',
+                                 'tag': None},
+            'components/comp3': {'hash': SUBMOD_HASH3, 'status': '+',
+                                 'tag': '(heads/main-3-gc3d4e5f)'},
+            'components/comp4': {'hash': SUBMOD_HASH4, 'status': 'U',
+                                 'tag': None},
+        }
+        self.assertEqual(_parse_submodule_status(git_output), expected)
+
+    def test_path_with_spaces(self):
+        """Test that a path containing spaces is not split from its
+        describe output.
+
+        """
+        git_output = (' {0} my comp (v1.2.0)\n'
+                      '+{1} other comp\n').format(SUBMOD_HASH1, SUBMOD_HASH3)
+        submodules = _parse_submodule_status(git_output)
+        self.assertEqual(sorted(submodules), ['my comp', 'other comp'])
+        self.assertEqual(submodules['my comp']['tag'], '(v1.2.0)')
+        self.assertIsNone(submodules['other comp']['tag'])
+
+    def test_no_submodules(self):
+        """Test that empty output gives no submodules.
+        """
+        self.assertEqual(_parse_submodule_status(''), {})
+
+
+class _FakeGitTestCase(unittest.TestCase):
+    """Base class for tests that replace the git submodule status command
+    with fake output. Tests set self._git_output and can check the
+    commands run in self._calls.
+
+    """
+
+    def setUp(self):
+        """Replace execute_subprocess with a fake that records its calls
+        """
+        self._original_execute = manic.externals_description.execute_subprocess
+        manic.externals_description.execute_subprocess = self._fake_execute
+        self._calls = []
+        self._git_output = EMPTY_STR
+        clear_submodule_caches()
+
+    def tearDown(self):
+        """Restore execute_subprocess and drop cached results
+        """
+        manic.externals_description.execute_subprocess = self._original_execute
+        clear_submodule_caches()
+
+    #
+    # mock methods replacing git system calls
+    #
+    def _fake_execute(self, commands, status_to_caller=False,
+                      output_to_caller=False, cwd=None):
+        """mock function that can take the place of execute_subprocess,
+        returning the current fake output"""
+        # pylint: disable=unused-argument
+        self._calls.append((commands, cwd))
+        return self._git_output
+
+
+class TestGitSubmoduleStatus(_FakeGitTestCase):
+    """Test caching of git submodule status results
+    """
+
+    def setUp(self):
+        """Fake output for a single submodule
+        """
+        _FakeGitTestCase.setUp(self)
+        self._git_output = ' {0} comp1 (v1)\n'.format(SUBMOD_HASH1)
+
+    def test_result_cached(self):
+        """Test that repeated calls for the same directory only run git
+        once.
+
+        """
+        first = git_submodule_status('repo')
+        second = git_submodule_status(os.path.abspath('repo'))
+        self.assertEqual(len(self._calls), 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first['comp1']['hash'], SUBMOD_HASH1)
+
+    def test_clear_caches(self):
+        """Test that after clear_submodule_caches git is run again and the
+        new hash is returned.
+
+        """
+        git_submodule_status('repo')
+        self._git_output = '+{0} comp1 (v2)\n'.format(SUBMOD_HASH2)
+        self.assertEqual(git_submodule_status('repo')['comp1']['hash'],
+                         SUBMOD_HASH1)
+        clear_submodule_caches()
+        submods = git_submodule_status('repo')
+        self.assertEqual(len(self._calls), 2)
+        self.assertEqual(submods['comp1']['hash'], SUBMOD_HASH2)
+        self.assertEqual(submods['comp1']['status'], '+')
+
+    def test_cache_not_corrupted(self):
+        """Test that modifying a returned result does not change the
+        result of later calls.
+
+        """
+        first = git_submodule_status('repo')
+        first['comp1']['hash'] = 'junk'
+        del first['comp1']
+        first['comp2'] = {}
+        second = git_submodule_status('repo')
+        self.assertEqual(len(self._calls), 1)
+        self.assertEqual(sorted(second), ['comp1'])
+        self.assertEqual(second['comp1']['hash'], SUBMOD_HASH1)
+
+
+class _FakeParentRepo(object):
+    """Parent git repository that counts requests for its submodules file
+    """
+
+    def __init__(self):
+        self.submodules_file_calls = 0
+
+    @staticmethod
+    def name():
+        """Name of the parent repository"""
+        return 'parent'
+
+    @staticmethod
+    def protocol():
+        """Protocol of the parent repository"""
+        return ExternalsDescription.PROTOCOL_GIT
+
+    def submodules_file(self, repo_path=None):
+        """Path to the .gitmodules file in repo_path"""
+        self.submodules_file_calls += 1
+        return os.path.join(repo_path,
+                            ExternalsDescription.GIT_SUBMODULES_FILENAME)
+
+
+class TestSubmoduleDescriptionCache(_FakeGitTestCase):
+    """Test that submodule descriptions are shared between externals
+    descriptions with the same parent repository and directory.
+
+    """
+
+    def setUp(self):
+        """Create two directories with a .gitmodules file
+        """
+        _FakeGitTestCase.setUp(self)
+        self._return_dir = os.getcwd()
+        self._tmpdir = tempfile.mkdtemp()
+        self._repo_dirs = []
+        for name in ('repo1', 'repo2'):
+            repo_dir = os.path.join(self._tmpdir, name)
+            os.mkdir(repo_dir)
+            with open(os.path.join(repo_dir, '.gitmodules'), 'w') as fhandle:
+                fhandle.write('[submodule "sub"]\n'
+                              '\tpath = sub\n'
+                              '\turl = https://example.com/sub.git\n')
+            self._repo_dirs.append(repo_dir)
+        os.chdir(self._repo_dirs[0])
+        self._git_output = ' {0} sub (v1)\n'.format(SUBMOD_HASH1)
+        self._parent = _FakeParentRepo()
+
+    def tearDown(self):
+        """Restore the working directory and remove the test directories
+        """
+        _FakeGitTestCase.tearDown(self)
+        os.chdir(self._return_dir)
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def _create_description(self):
+        """Create an externals description with a from_submodule external
+        """
+        config = config_parser()
+        config.add_section('sub')
+        config.set('sub', ExternalsDescription.PROTOCOL,
+                   ExternalsDescription.PROTOCOL_GIT)
+        config.set('sub', ExternalsDescription.REQUIRED, 'True')
+        config.set('sub', ExternalsDescription.SUBMODULE, 'True')
+        config.add_section(DESCRIPTION_SECTION)
+        config.set(DESCRIPTION_SECTION, VERSION_ITEM, '1.0.0')
+        return ExternalsDescriptionConfigV1(config, parent_repo=self._parent)
+
+    def test_description_reused(self):
+        """Test that a second description in the same directory reuses the
+        cached submodule description.
+
+        """
+        first = self._create_description()
+        second = self._create_description()
+        self.assertEqual(self._parent.submodules_file_calls, 1)
+        for desc in (first, second):
+            repo = desc['sub'][ExternalsDescription.REPO]
+            self.assertEqual(repo[ExternalsDescription.HASH], SUBMOD_HASH1)
+            self.assertEqual(repo[ExternalsDescription.REPO_URL],
+                             'https://example.com/sub.git')
+            self.assertEqual(desc['sub'][ExternalsDescription.PATH], 'sub')
+
+    def test_clear_caches(self):
+        """Test that after clear_submodule_caches the submodule description
+        is read again with the new hash.
+
+        """
+        self._create_description()
+        self._git_output = '+{0} sub (v2)\n'.format(SUBMOD_HASH2)
+        desc = self._create_description()
+        self.assertEqual(
+            desc['sub'][ExternalsDescription.REPO][ExternalsDescription.HASH],
+            SUBMOD_HASH1)
+        clear_submodule_caches()
+        desc = self._create_description()
+        self.assertEqual(self._parent.submodules_file_calls, 2)
+        self.assertEqual(
+            desc['sub'][ExternalsDescription.REPO][ExternalsDescription.HASH],
+            SUBMOD_HASH2)
+
+    def test_cache_keyed_by_cwd(self):
+        """Test that the submodule description is cached per working
+        directory.
+
+        """
+        self._create_description()
+        os.chdir(self._repo_dirs[1])
+        self._create_description()
+        self.assertEqual(self._parent.submodules_file_calls, 2)
+        self._create_description()
+        self.assertEqual(self._parent.submodules_file_calls, 2)
+        os.chdir(self._repo_dirs[0])
+        self._create_description()
+        self.assertEqual(self._parent.submodules_file_calls, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+"""Unit test driver for the FastConfig parser
+
+Note: this script assume the path to the checkout_externals.py module is
+already in the python path.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import unittest
+
+from configparser import ConfigParser
+from configparser import MissingSectionHeaderError, ParsingError
+from configparser import NoSectionError, NoOptionError
+from configparser import DuplicateSectionError, DuplicateOptionError
+
+from manic.fast_config import FastConfig
+
+
+class TestFastConfigRead(unittest.TestCase):
+    """Test parsing of config file contents
+    """
+
+    def test_read_sections_and_items(self):
+        """Test that sections and items are parsed in file order, with
+        option names converted to lower case and values stripped.
+
+        """
+        contents = """
+# leading comment
+[comp1]
+Local_Path = path/to/comp1
+protocol: git
+; another comment
+tag =
+
+[Comp2]
+repo_url=https://example.com/comp2
+"""
+        config = FastConfig()
+        config.read_string(contents)
+        self.assertEqual(config.sections(), ['comp1', 'Comp2'])
+        self.assertEqual(config.items('comp1'),
+                         [('local_path', 'path/to/comp1'),
+                          ('protocol', 'git'),
+                          ('tag', '')])
+        self.assertEqual(config.get('Comp2', 'REPO_URL'),
+                         'https://example.com/comp2')
+
+    def test_read_continuation(self):
+        """Test that indented lines continue the previous value.
+        """
+        contents = "[comp1]\nkey = first\n    second\n"
+        config = FastConfig()
+        config.read_string(contents)
+        self.assertEqual(config.get('comp1', 'key'), 'first\nsecond')
+
+    def test_read_missing_section_header(self):
+        """Test that items before any section header raise an error.
+        """
+        config = FastConfig()
+        with self.assertRaises(MissingSectionHeaderError):
+            config.read_string("<source_tree version='1.0.0'>\n")
+
+    def test_read_invalid_line(self):
+        """Test that a line which is not a section, item or comment raises
+        an error.
+
+        """
+        config = FastConfig()
+        with self.assertRaises(ParsingError):
+            config.read_string('[comp1]\nnot an item\n')
+
+    def test_read_duplicate_section(self):
+        """Test that a section repeated within a file raises an error.
+        """
+        config = FastConfig()
+        with self.assertRaises(DuplicateSectionError):
+            config.read_string('[comp1]\na = 1\n[comp1]\nb = 2\n')
+
+
+class TestFastConfigMatchesConfigParser(unittest.TestCase):
+    """Test that FastConfig parses the same inputs as ConfigParser
+    """
+
+    def _assert_same(self, contents):
+        """Parse contents with FastConfig and ConfigParser and check that
+        both produce the same sections and items.
+
+        """
+        fast = FastConfig()
+        fast.read_string(contents)
+        reference = ConfigParser(interpolation=None)
+        reference.read_string(contents)
+        self.assertEqual(fast.sections(), reference.sections())
+        for section in reference.sections():
+            self.assertEqual(fast.items(section), reference.items(section))
+        return fast
+
+    def test_indented_options(self):
+        """Test that options indented at the same level as the previous
+        option are new options, not continuations.
+
+        """
+        contents = """
+[comp1]
+    local_path = path/to/comp1
+    protocol = git
+"""
+        config = self._assert_same(contents)
+        self.assertEqual(config.get('comp1', 'protocol'), 'git')
+
+    def test_deeper_indent_continuation(self):
+        """Test that lines indented deeper than an indented option
+        continue its value.
+
+        """
+        contents = """
+[comp1]
+  key = first
+      second
+  other = value
+"""
+        config = self._assert_same(contents)
+        self.assertEqual(config.get('comp1', 'key'), 'first\nsecond')
+
+    def test_section_trailing_comment(self):
+        """Test that text after the closing bracket of a section header
+        is ignored.
+
+        """
+        contents = "[comp1]  # note\nkey = value\n"
+        config = self._assert_same(contents)
+        self.assertEqual(config.sections(), ['comp1'])
+
+    def test_blank_line_in_multiline_value(self):
+        """Test that a blank line inside a multiline value is kept, and
+        that trailing blank lines are dropped.
+
+        """
+        contents = "[comp1]\nkey = first\n\n    second\n\n[comp2]\na = 1\n"
+        config = self._assert_same(contents)
+        self.assertEqual(config.get('comp1', 'key'), 'first\n\nsecond')
+
+    def test_comment_in_multiline_value(self):
+        """Test that a comment line does not end a multiline value.
+        """
+        contents = "[comp1]\nkey = first\n# comment\n    second\n"
+        config = self._assert_same(contents)
+        self.assertEqual(config.get('comp1', 'key'), 'first\nsecond')
+
+    def test_default_section(self):
+        """Test that [DEFAULT] provides fallback values and is not
+        reported as a section.
+
+        """
+        contents = """
+[DEFAULT]
+protocol = git
+required = False
+
+[comp1]
+required = True
+"""
+        config = self._assert_same(contents)
+        self.assertFalse(config.has_section('DEFAULT'))
+        self.assertEqual(config.get('comp1', 'protocol'), 'git')
+        self.assertEqual(config.get('comp1', 'required'), 'True')
+
+    def test_duplicate_option(self):
+        """Test that an option repeated within a section raises the same
+        error as ConfigParser.
+
+        """
+        contents = "[comp1]\ntag = v1\nTag = v2\n"
+        with self.assertRaises(DuplicateOptionError):
+            ConfigParser(interpolation=None).read_string(contents)
+        with self.assertRaises(DuplicateOptionError):
+            FastConfig().read_string(contents)
+
+
+class TestFastConfigInterface(unittest.TestCase):
+    """Test the ConfigParser compatible interface
+    """
+
+    def setUp(self):
+        """Reusable config object
+        """
+        self._config = FastConfig()
+        self._config.add_section('section1')
+        self._config.set('section1', 'keyword', 'value')
+
+    def test_get_missing_section(self):
+        """Test that get raises NoSectionError for an unknown section.
+        """
+        with self.assertRaises(NoSectionError):
+            self._config.get('section2', 'keyword')
+
+    def test_get_missing_option(self):
+        """Test that get raises NoOptionError for an unknown option.
+        """
+        with self.assertRaises(NoOptionError):
+            self._config.get('section1', 'other')
+
+    def test_set_missing_section(self):
+        """Test that set raises NoSectionError for an unknown section.
+        """
+        with self.assertRaises(NoSectionError):
+            self._config.set('section2', 'keyword', 'value')
+
+    def test_add_duplicate_section(self):
+        """Test that adding an existing section raises an error.
+        """
+        with self.assertRaises(DuplicateSectionError):
+            self._config.add_section('section1')
+
+    def test_add_default_section(self):
+        """Test that the default section cannot be added explicitly.
+        """
+        with self.assertRaises(ValueError):
+            self._config.add_section('DEFAULT')
+
+    def test_remove_section(self):
+        """Test that remove_section reports whether the section existed.
+        """
+        self.assertTrue(self._config.remove_section('section1'))
+        self.assertFalse(self._config.has_section('section1'))
+        self.assertFalse(self._config.remove_section('section1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,6 +50,17 @@ class TestExecuteSubprocess(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             execute_subprocess(cmd, status_to_caller=False)
 
+    def test_exesub_cwd(self):
+        """Test that execute_subprocess runs the command in the requested
+        directory without changing the current working directory.
+
+        """
+        cwd = os.getcwd()
+        cmd = ['pwd']
+        output = execute_subprocess(cmd, output_to_caller=True, cwd='/')
+        self.assertEqual(output.strip(), '/')
+        self.assertEqual(os.getcwd(), cwd)
+
 
 class TestLastNLines(unittest.TestCase):
     """Test the last_n_lines function.